@@ -4,6 +4,7 @@ import os
 import json
 from aas_test_engines import api, file
 from enum import Enum
+from itertools import islice
 
 
 class InputFormats(Enum):
@@ -76,6 +77,10 @@ def run_api_test(argv):
     parser.add_argument('--no-verify',
                         action='store_true',
                         help='do not check TLS certificate')
+    parser.add_argument('--max-concurrency',
+                        type=int,
+                        default=1,
+                        help='maximum number of concurrent requests')
     args = parser.parse_args(argv)
     if args.suite:
         suites = set([args.suite])
@@ -86,6 +91,7 @@ def run_api_test(argv):
         server=args.server,
         dry=args.dry,
         verify=not args.no_verify,
+        max_concurrency=args.max_concurrency,
     )
     for result in api.execute_tests(tests, exec_conf):
         result.dump()
@@ -101,13 +107,9 @@ def generate_files(argv):
         print(f"Directory '{args.directory}' already exists, please remove it")
         exit(1)
     os.mkdir(args.directory)
-    i = 0
-    for sample in file.generate():
+    for i, sample in enumerate(islice(file.generate(), 101)):
         with open(os.path.join(args.directory, f"{i}.json"), "w") as f:
             f.write(sample)
-        i += 1
-        if i > 100:
-            break
 
 
 commands = {
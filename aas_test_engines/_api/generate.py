@@ -2,6 +2,7 @@ from typing import Dict, List, Optional, Set, Tuple
 
 from dataclasses import dataclass, field
 import hashlib
+from functools import lru_cache
 import json
 from urllib.parse import urlencode
 import os
@@ -74,38 +75,47 @@ def generate_link_id(source_op: openapi.Operation, param: str, target_op: openap
     return hashlib.sha256(id_.encode()).hexdigest()
 
 
+_SAMPLES_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'data', 'api', 'samples')
+
+# TODO: make this configurable
+_SAMPLE_FILES = {
+    '#/components/schemas/AssetAdministrationShell': 'aas.json',
+    '#/components/schemas/AssetInformation': 'asset_info.json',
+    '#/components/schemas/Reference': 'model_reference.json',
+    '#/components/schemas/Submodel': 'submodel.json',
+    '#/components/schemas/SubmodelElement': 'submodel_element.json',
+    '#/components/schemas/OperationRequest': 'operation_request.json',
+    '#/components/schemas/AssetAdministrationShellDescriptor': 'shell_descriptor.json',
+    '#/components/schemas/SubmodelDescriptor': 'submodel_descriptor.json',
+    '#/components/schemas/ConceptDescription': 'empty.json',
+    '#/components/schemas/Identifier': 'empty.json',
+    '#/components/schemas/IdentifierKeyValuePair': 'empty.json',
+    '#/components/schemas/SubmodelMetadata': 'empty.json',
+    '#/components/schemas/SubmodelValue': 'empty.json',
+    '#/components/schemas/SubmodelElementMetadata': 'empty.json',
+    '#/components/schemas/SubmodelElementValue': 'empty.json',
+    '#/components/schemas/OperationRequestValueOnly': 'empty.json',
+    '#/components/schemas/GetSubmodelElementsMetadataResult': 'empty.json',
+    '#/components/schemas/GetSubmodelElementsValueResult': 'empty.json',
+    '#/components/schemas/SpecificAssetId': 'empty.json',
+}
+
+
+@lru_cache(maxsize=None)
+def _load_sample(name: str):
+    with open(os.path.join(_SAMPLES_DIR, name), "rb") as f:
+        return json.load(f)
+
+
 def generate_valid_samples(schema: Optional[dict]):
     if 'enum' in schema:
         return schema['enum']
     if '$ref' in schema:
         ref = schema['$ref']
-        samples_dir = os.path.dirname(
-            os.path.realpath(__file__)) + '/../data/api/samples/'
-        # TODO: make this configurable
-        path = {
-            '#/components/schemas/AssetAdministrationShell': 'aas.json',
-            '#/components/schemas/AssetInformation': 'asset_info.json',
-            '#/components/schemas/Reference': 'model_reference.json',
-            '#/components/schemas/Submodel': 'submodel.json',
-            '#/components/schemas/SubmodelElement': 'submodel_element.json',
-            '#/components/schemas/OperationRequest': 'operation_request.json',
-            '#/components/schemas/AssetAdministrationShellDescriptor': 'shell_descriptor.json',
-            '#/components/schemas/SubmodelDescriptor': 'submodel_descriptor.json',
-            '#/components/schemas/ConceptDescription': 'empty.json',
-            '#/components/schemas/Identifier': 'empty.json',
-            '#/components/schemas/IdentifierKeyValuePair': 'empty.json',
-            '#/components/schemas/SubmodelMetadata': 'empty.json',
-            '#/components/schemas/SubmodelValue': 'empty.json',
-            '#/components/schemas/SubmodelElementMetadata': 'empty.json',
-            '#/components/schemas/SubmodelElementValue': 'empty.json',
-            '#/components/schemas/OperationRequestValueOnly': 'empty.json',
-            '#/components/schemas/GetSubmodelElementsMetadataResult': 'empty.json',
-            '#/components/schemas/GetSubmodelElementsValueResult': 'empty.json',
-            '#/components/schemas/SpecificAssetId': 'empty.json',
-        }.get(ref)
+        path = _SAMPLE_FILES.get(ref)
         if path:
             # TODO: check if example matches the schema
-            return [json.load(open(samples_dir + path, "rb"))]
+            return [_load_sample(path)]
         else:
             raise Exception("Failed to generate valid samples for " + schema['$ref'])
     type_ = schema.get('type', 'object')
@@ -185,6 +195,21 @@ def generate_positive_tests(test_cases: List[runconf.TestCase], path: str, opera
     all_params: List[RequestParams] = []
 
     if options:
+        # The expected response is the same for all test cases of this operation
+        if response.schema is not None:
+            res = runconf.Response(
+                code=response.code,
+                content=json.dumps(response.schema),
+                match=runconf.MatchType.JSON_SCHEMA,
+                variables=variables
+            )
+        else:
+            res = runconf.Response(
+                code=response.code,
+                content='',
+                match=runconf.MatchType.STATUS_CODE_ONLY,
+                variables=variables
+            )
         num_test_cases = max([len(i.values) for i in options])
         for i in range(num_test_cases):
             params = RequestParams()
@@ -194,20 +219,6 @@ def generate_positive_tests(test_cases: List[runconf.TestCase], path: str, opera
                     option.inject(params, value)
 
             req = params.to_request(path, operation.method)
-            if response.schema is not None:
-                res = runconf.Response(
-                    code=response.code,
-                    content=json.dumps(response.schema),
-                    match=runconf.MatchType.JSON_SCHEMA,
-                    variables=variables
-                )
-            else:
-                res = runconf.Response(
-                    code=response.code,
-                    content='',
-                    match=runconf.MatchType.STATUS_CODE_ONLY,
-                    variables=variables
-                )
             test_cases.append(runconf.TestCase(req, res))
             all_params.append(params)
     else:
@@ -255,6 +266,12 @@ def generate_negative_tests(test_cases: List[runconf.TestCase],  positive_params
             generate_invalid_samples(operation.request_body.schema)
         ))
 
+    res = runconf.Response(
+        code=response.code,
+        content=json.dumps(response.schema),
+        match=runconf.MatchType.JSON_SCHEMA,
+        variables={},
+    )
     positive_params_idx = 0
     for option in options:
         for value in option.values:
@@ -264,12 +281,6 @@ def generate_negative_tests(test_cases: List[runconf.TestCase],  positive_params
             positive_params_idx = (
                 positive_params_idx + 1) % len(positive_params)
             req = params.to_request(path, operation.method)
-            res = runconf.Response(
-                code=response.code,
-                content=json.dumps(response.schema),
-                match=runconf.MatchType.JSON_SCHEMA,
-                variables={},
-            )
             test_cases.append(runconf.TestCase(req, res))
 
 
@@ -303,27 +314,25 @@ def generate_tests(test_cases: List[runconf.TestCase], path: str, operation: ope
                             path, operation, negative_response)
 
 
-def has_all_params(operation: openapi.Operation, already_tested: Set[str]) -> bool:
-    for param in operation.parameters:
-        if param.source_link:
-            if param.source_link.source_operation.operation_id not in already_tested:
-                return False
-    return True
+def get_dependencies(operation: openapi.Operation) -> Set[str]:
+    return {
+        param.source_link.source_operation.operation_id
+        for param in operation.parameters
+        if param.source_link
+    }
 
 
-def get_next(api: openapi.OpenApi, already_tested: Set[str], tag_filter: Set[str]) -> Tuple[openapi.Path, openapi.Operation]:
+def get_next(candidates: List[Tuple[openapi.Path, List[openapi.Operation]]], already_tested: Set[str], dependencies: Dict[str, Set[str]]) -> Tuple[openapi.Path, openapi.Operation]:
 
     def find(delete_only: bool):
-        it = reversed(api.paths) if delete_only else api.paths
-        for path in it:
-            for operation in path.operations:
+        it = reversed(candidates) if delete_only else candidates
+        for path, operations in it:
+            for operation in operations:
                 if (operation.method == 'delete') != delete_only:
                     continue
-                if not (operation.tags & tag_filter):
-                    continue
                 if operation.operation_id in already_tested:
                     continue
-                if has_all_params(operation, already_tested):
+                if dependencies[operation.operation_id] <= already_tested:
                     return path, operation
 
     result = find(False)
@@ -338,13 +347,21 @@ def get_next(api: openapi.OpenApi, already_tested: Set[str], tag_filter: Set[str
 def generate(api: openapi.OpenApi, tag_filter=Set[str]):
     test_cases: List[runconf.TestCase] = []
     num_ops = 0
+    dependencies: Dict[str, Set[str]] = {}
+    # operations selected by the tag filter, grouped by path
+    candidates: List[Tuple[openapi.Path, List[openapi.Operation]]] = []
     for path in api.paths:
+        operations = []
         for op in path.operations:
-            if op.tags & tag_filter:
-                num_ops += 1
+            if not op.tags.isdisjoint(tag_filter):
+                operations.append(op)
+            dependencies[op.operation_id] = get_dependencies(op)
+        if operations:
+            candidates.append((path, operations))
+            num_ops += len(operations)
     already_tested: Set[str] = set()
     while len(already_tested) != num_ops:
-        next_path, next_operation = get_next(api, already_tested, tag_filter)
+        next_path, next_operation = get_next(candidates, already_tested, dependencies)
         already_tested.add(next_operation.operation_id)
         generate_tests(test_cases, next_path.path, next_operation)
     return runconf.RunConfig(
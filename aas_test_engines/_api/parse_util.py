@@ -13,9 +13,13 @@ def assert_type(value: Any, _type: Type, json_path: str):
 
 
 def safe_dict_lookup(data: dict, key: str, _type: Type, json_path: str, default=NoDefault):
-    if key not in data:
+    try:
+        value = data[key]
+    except KeyError:
         if default is not NoDefault:
             return default
-        else:
-            raise KeyError('Expected key "{}" at {}'.format(key, json_path))
-    return assert_type(data[key], _type, json_path + '.' + key)
+        raise KeyError('Expected key "{}" at {}'.format(key, json_path)) from None
+    if not isinstance(value, _type):
+        # build the path only if we actually report an error
+        assert_type(value, _type, json_path + '.' + key)
+    return value
@@ -3,19 +3,23 @@
 from dataclasses import dataclass
 from .runconf import RunConfig, TestCase, Response, MatchType
 import json
-from typing import Dict, Optional, Generator
+from typing import Dict, List, Optional, Generator, Tuple
 from string import Template
 from aas_test_engines.result import AasTestResult, Level
 
 from .runtime_expression import RuntimeExpressionException
 
 import requests
+from http.cookiejar import DefaultCookiePolicy
+from requests.adapters import HTTPAdapter
 import base64
+from concurrent.futures import Future, ThreadPoolExecutor
 
 from aas_test_engines.exception import AasTestToolsException
 from json_schema_tool import parse_schema
-from json_schema_tool.schema import ParseConfig
+from json_schema_tool.schema import ParseConfig, SchemaValidator
 from aas_test_engines.file import _map_error
+from aas_test_engines._util import json_loads
 
 from dataclasses import dataclass
 
@@ -25,19 +29,39 @@ class ExecConf:
     server: str = ''
     dry: bool = False
     verify: bool = True
+    max_concurrency: int = 1
 
 
-def _check_server(exec_conf: ExecConf) -> AasTestResult:
+def _check_server(exec_conf: ExecConf, session: requests.Session) -> AasTestResult:
     result = AasTestResult(f'Check {exec_conf.server}')
     try:
-        requests.get(exec_conf.server, verify=exec_conf.verify)
+        # We only check reachability, so avoid downloading the body
+        response = session.head(exec_conf.server, verify=exec_conf.verify, allow_redirects=True)
+        if response.status_code in (405, 501):
+            session.get(exec_conf.server, verify=exec_conf.verify, stream=True).close()
         result.append(AasTestResult('OK', '', Level.INFO))
     except requests.exceptions.RequestException as e:
         result.append(AasTestResult('Failed to reach: {}'.format(e), '', Level.ERROR))
     return result
 
 
-def _check_response(test_case: TestCase, actual: requests.models.Response, data: Optional[dict], config: RunConfig, result: AasTestResult):
+def _get_validator(content: str, config: RunConfig, validators: Dict[str, Optional[SchemaValidator]]) -> Optional[SchemaValidator]:
+    try:
+        return validators[content]
+    except KeyError:
+        pass
+    schema = json.loads(content)
+    if schema is None:
+        validator = None
+    else:
+        schema['components'] = config.components
+        schema["$schema"] = "https://json-schema.org/draft/2020-12/schema"
+        validator = parse_schema(schema, ParseConfig(raise_on_unknown_format=False))
+    validators[content] = validator
+    return validator
+
+
+def _check_response(test_case: TestCase, actual: requests.models.Response, data: Optional[dict], config: RunConfig, validators: Dict[str, Optional[SchemaValidator]], result: AasTestResult):
     expected = test_case.response
     if actual.status_code == expected.code:
         result.append(AasTestResult(f'Got status code {expected.code}'))
@@ -45,12 +69,9 @@ def _check_response(test_case: TestCase, actual: requests.models.Response, data:
         result.append(AasTestResult(f"invalid status code: expected {expected.code}, got {actual.status_code}", '', Level.ERROR))
 
     if expected.match == MatchType.JSON_SCHEMA:
-        schema = json.loads(test_case.response.content)
-        if schema is None:
+        validator = _get_validator(test_case.response.content, config, validators)
+        if validator is None:
             return
-        schema['components'] = config.components
-        schema["$schema"] = "https://json-schema.org/draft/2020-12/schema"
-        validator = parse_schema(schema, ParseConfig(raise_on_unknown_format=False))
         error = validator.validate(data)
         _map_error(result, error)
     elif expected.match == MatchType.STATUS_CODE_ONLY:
@@ -68,13 +89,27 @@ def inject_variables(value: str, variables: Dict[str, str]) -> str:
     return TemplateWithNumericIds(value).substitute(variables)
 
 
-def _run_test_case(test_case: TestCase, exec_conf: ExecConf, variables: Dict[str, str], config: RunConfig) -> AasTestResult:
-    url = exec_conf.server + test_case.request.path
+def _prepare_request(test_case: TestCase, exec_conf: ExecConf, variables: Dict[str, str]) -> Tuple[str, str]:
+    url = inject_variables(exec_conf.server + test_case.request.path, variables)
+    data = inject_variables(test_case.request.body, variables)
+    return url, data
+
+
+def _send_request(test_case: TestCase, exec_conf: ExecConf, session: requests.Session, url: str, data: str) -> requests.models.Response:
+    return session.request(
+        method=test_case.request.method,
+        url=url,
+        data=data,
+        headers=test_case.request.headers,
+        verify=exec_conf.verify,
+    )
+
+
+def _run_test_case(test_case: TestCase, exec_conf: ExecConf, session: requests.Session, variables: Dict[str, str], config: RunConfig, validators: Dict[str, Optional[SchemaValidator]], pending: Optional[Future] = None) -> AasTestResult:
     method = test_case.request.method
 
     try:
-        url = inject_variables(url, variables)
-        data = inject_variables(test_case.request.body, variables)
+        url, data = _prepare_request(test_case, exec_conf, variables)
     except KeyError as e:
         m = "Failed to substitute variable {}, considering test case as failed".format(e.args[0])
         return AasTestResult(m, '', Level.ERROR)
@@ -87,19 +122,20 @@ def _run_test_case(test_case: TestCase, exec_conf: ExecConf, variables: Dict[str
         result.append(AasTestResult('Skipped', '', Level.WARNING))
         return result
     else:
-        response = requests.request(
-            method=method,
-            url=url,
-            data=data,
-            headers=test_case.request.headers,
-            verify=exec_conf.verify,
-        )
-        try:
-            data = response.json()
-        except:
+        if pending is None:
+            response = _send_request(test_case, exec_conf, session, url, data)
+        else:
+            response = pending.result()
+        # Only decode the body if it is validated or variables are captured from it
+        if test_case.response.match == MatchType.JSON_SCHEMA or test_case.response.variables:
+            try:
+                data = json_loads(response.content)
+            except:
+                data = None
+        else:
             data = None
 
-        _check_response(test_case, response, data, config, result)
+        _check_response(test_case, response, data, config, validators, result)
         for name, expression in test_case.response.variables.items():
             try:
                 # TODO: str() will fail for non primitive types
@@ -117,12 +153,62 @@ def _run_test_case(test_case: TestCase, exec_conf: ExecConf, variables: Dict[str
     return result
 
 
+def _independent_batches(test_cases: List[TestCase]) -> Generator[List[TestCase], None, None]:
+    # Consecutive GET requests can be sent concurrently, as long as none of them
+    # consumes a variable which is captured from the response of another one.
+    batch: List[TestCase] = []
+    captured: List[str] = []
+    for test_case in test_cases:
+        request = test_case.request
+        depends = any('!{' + name in request.path or '!{' + name in request.body for name in captured)
+        if request.method != 'get' or depends:
+            if batch:
+                yield batch
+            batch, captured = [], []
+            if request.method != 'get':
+                yield [test_case]
+                continue
+        batch.append(test_case)
+        captured.extend(test_case.response.variables.keys())
+    if batch:
+        yield batch
+
+
+def _run_concurrently(config: RunConfig, exec_conf: ExecConf, session: requests.Session, variables: Dict[str, str], validators: Dict[str, Optional[SchemaValidator]]) -> Generator[AasTestResult, None, None]:
+    with ThreadPoolExecutor(max_workers=exec_conf.max_concurrency) as executor:
+        for batch in _independent_batches(config.test_cases):
+            pending: List[Optional[Future]] = []
+            for test_case in batch:
+                try:
+                    url, data = _prepare_request(test_case, exec_conf, variables)
+                except KeyError:
+                    # reported by _run_test_case
+                    pending.append(None)
+                    continue
+                pending.append(executor.submit(_send_request, test_case, exec_conf, session, url, data))
+            # Responses are evaluated in order, so results and variables are the same as for a sequential run
+            for test_case, future in zip(batch, pending):
+                yield _run_test_case(test_case, exec_conf, session, variables, config, validators, future)
+
+
 def run(config: RunConfig, exec_conf: ExecConf) -> Generator[AasTestResult, None, None]:
-    if not exec_conf.dry:
-        result = _check_server(exec_conf)
-        yield result
-        if not result.ok():
+    # A single session keeps the connection to the server alive across all test cases
+    with requests.Session() as session:
+        # Do not store cookies, each test case must be sent exactly as specified
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        # One pooled connection per worker, the test cases only talk to a single server
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, exec_conf.max_concurrency), max_retries=0)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        if not exec_conf.dry:
+            result = _check_server(exec_conf, session)
+            yield result
+            if not result.ok():
+                return
+        variables: Dict[str, str] = {}
+        validators: Dict[str, Optional[SchemaValidator]] = {}
+        if exec_conf.max_concurrency > 1 and not exec_conf.dry:
+            yield from _run_concurrently(config, exec_conf, session, variables, validators)
             return
-    variables: Dict[str, str] = {}
-    for test_case in config.test_cases:
-        yield _run_test_case(test_case, exec_conf, variables, config)
+        for test_case in config.test_cases:
+            yield _run_test_case(test_case, exec_conf, session, variables, config, validators)
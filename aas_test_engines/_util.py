@@ -1,4 +1,33 @@
-from typing import Dict, List
+from typing import Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+
+import os
+import json
+import yaml
+
+from .exception import AasTestToolsException
+
+try:
+    # libyaml based loader, if pyyaml was built with it
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+def yaml_load(data: bytes) -> any:
+    return yaml.load(data, Loader=SafeLoader)
+
+try:
+    # optional dependency, see the 'fast' extra
+    import orjson
+
+    def json_loads(data: any) -> any:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson is stricter (e.g. no byte order mark, utf-8 only),
+            # so let the json module accept or reject the input as before
+            return json.loads(data)
+except ImportError:
+    json_loads = json.loads
 
 def _group(elements: list) -> dict:
     assert isinstance(elements, list)
@@ -7,10 +36,7 @@ def _group(elements: list) -> dict:
         assert isinstance(item, dict)
         key = item.get('idShort')
         assert isinstance(key, str)
-        try:
-            grouped[key].append(item)
-        except KeyError:
-            grouped[key] = [item]
+        grouped.setdefault(key, []).append(item)
     return grouped
 
 def group(data: any) -> any:
@@ -40,8 +66,6 @@ def _un_group(elements: dict) -> list:
 def un_group(data: any) -> any:
     if isinstance(data, list):
         data = [un_group(i) for i in data]
-        for idx, value in enumerate(data):
-            data[idx] = un_group(value)
     elif isinstance(data, dict):
         data = {key: un_group(value) for key, value in data.items()}
         if data.get('modelType') == 'SubmodelElementCollection':
@@ -51,3 +75,31 @@ def un_group(data: any) -> any:
             elements = data.get('submodelElements')
             data['submodelElements'] = _un_group(elements)
     return data
+
+T = TypeVar('T')
+
+class VersionedData(Generic[T]):
+    """Files '<version>.yml' shipped in data_dir, each one is loaded on first use only"""
+
+    def __init__(self, data_dir: str, load: Callable[[str], T]) -> None:
+        self.data_dir = data_dir
+        self._load = load
+        self._loaded: Dict[str, T] = {}
+        self._versions: Optional[Tuple[str, ...]] = None
+
+    def versions(self) -> Tuple[str, ...]:
+        # The data dir is shipped with the package and does not change at runtime
+        if self._versions is None:
+            self._versions = tuple(sorted(i[:-4] for i in os.listdir(self.data_dir) if i.endswith('.yml')))
+        return self._versions
+
+    def get(self, version: str) -> T:
+        try:
+            return self._loaded[version]
+        except KeyError:
+            pass
+        versions = self.versions()
+        if version not in versions:
+            raise AasTestToolsException(f"Unknown version {version}, must be one of {list(versions)}")
+        data = self._loaded[version] = self._load(os.path.join(self.data_dir, f"{version}.yml"))
+        return data
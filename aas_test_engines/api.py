@@ -1,56 +1,107 @@
-from typing import Dict, Set, Generator
+from typing import List, Set, FrozenSet, Generator, Optional, Tuple, Type
 from .exception import AasTestToolsException
 from .result import AasTestResult
+from ._util import VersionedData, yaml_load
+from . import version as _package_version
 
 from ._api import openapi
 from ._api import generate
 from ._api import runconf
 from ._api import run
+from ._api import runtime_expression
 
 import os
-from yaml import safe_load
+import pickle
+import warnings
+import jsonpath_ng.jsonpath
 
 
 class AasSpec:
 
-    def __init__(self, api: openapi.OpenApi, tags: Set[str]) -> None:
+    def __init__(self, api: openapi.OpenApi, tags: FrozenSet[str]) -> None:
         self.api = api
         self.tags = tags
 
 
-def _find_specs() -> Dict[str, AasSpec]:
-    result = {}
-    script_dir = os.path.dirname(os.path.realpath(__file__))
-    data_dir = os.path.join(script_dir, 'data', 'api')
-    for i in os.listdir(data_dir):
-        path = os.path.join(data_dir, i)
-        if not i.endswith('.yml'):
-            continue
-        spec = safe_load(open(path, "rb"))
-        api = openapi.OpenApi.from_dict(spec)
-        suites = set()
-        for path in api.paths:
-            for operation in path.operations:
-                suites.update(operation.tags)
-        result[i[:-4]] = AasSpec(api, suites)
-    return result
+# Modules defining the classes which end up in the pickled spec
+_PICKLED_MODULES = [__file__, openapi.__file__, runtime_expression.__file__, jsonpath_ng.jsonpath.__file__]
 
 
-_specs = _find_specs()
+def _cache_stamp(path: str) -> tuple:
+    # The cache holds pickled objects, so it must be invalidated if either
+    # the spec or the classes describing it change
+    stat = os.stat(path)
+    return (_package_version(), stat.st_mtime_ns, stat.st_size, *(os.stat(i).st_mtime_ns for i in _PICKLED_MODULES))
 
-_DEFAULT_VERSION = '3.0'
+
+# A parsed spec together with the warnings raised while parsing it
+_CachedSpec = Tuple[AasSpec, List[Tuple[Type[Warning], str]]]
 
 
-def _get_spec(version: str) -> AasSpec:
+def _load_cached_spec(cache_path: str, stamp: tuple) -> Optional[_CachedSpec]:
+    try:
+        with open(cache_path, "rb") as f:
+            cached_stamp, cached = pickle.load(f)
+    except Exception:
+        # missing, truncated or written by an incompatible version
+        return None
+    if cached_stamp != stamp:
+        return None
+    return cached
+
+
+def _store_cached_spec(cache_path: str, stamp: tuple, cached: _CachedSpec):
+    # Write to a temporary file first, so that a concurrently running process
+    # never reads a partially written cache
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
     try:
-        return _specs[version]
-    except KeyError:
-        raise AasTestToolsException(
-            f"Unknown version {version}, must be one of {supported_versions()}")
+        with open(tmp_path, "wb") as f:
+            pickle.dump((stamp, cached), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # data dir might be read-only, caching is optional
+        pass
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _parse_spec(path: str) -> AasSpec:
+    with open(path, "rb") as f:
+        spec = yaml_load(f.read())
+    api = openapi.OpenApi.from_dict(spec)
+    suites = set()
+    for api_path in api.paths:
+        for operation in api_path.operations:
+            suites.update(operation.tags)
+    return AasSpec(api, frozenset(suites))
+
+
+def _load_spec(path: str) -> AasSpec:
+    cache_path = path + '.cache.pkl'
+    stamp = _cache_stamp(path)
+    cached = _load_cached_spec(cache_path, stamp)
+    if cached is None:
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            spec = _parse_spec(path)
+        cached = spec, [(i.category, str(i.message)) for i in caught]
+        _store_cached_spec(cache_path, stamp, cached)
+    spec, parse_warnings = cached
+    # Parsing is skipped if cached, warn anyway so the output does not depend on the cache
+    for category, message in parse_warnings:
+        warnings.warn(message, category)
+    return spec
+
+
+# Specs are parsed on first use only
+_specs = VersionedData(os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data', 'api'), _load_spec)
+
+_DEFAULT_VERSION = '3.0'
 
 
 def generate_tests(version: str = _DEFAULT_VERSION, suites: Set[str] = None) -> runconf.RunConfig:
-    spec = _get_spec(version)
+    spec = _specs.get(version)
     if suites is None:
         suites = spec.tags
     if not spec.tags.issuperset(suites):
@@ -64,7 +115,7 @@ def execute_tests(conf: runconf.RunConfig, exec_conf: run.ExecConf) -> Generator
 
 
 def supported_versions():
-    return {ver: spec.tags for ver, spec in _specs.items()}
+    return {ver: _specs.get(ver).tags for ver in _specs.versions()}
 
 
 def latest_version():
@@ -1,7 +1,6 @@
-from typing import List, Dict, TextIO, Union, Any, Set, Optional, Generator
+from typing import List, Dict, TextIO, Union, Any, Set, FrozenSet, Optional, Generator
 import os
 import json
-from yaml import safe_load
 
 from .exception import AasTestToolsException
 from .result import AasTestResult, Level
@@ -13,8 +12,9 @@ from json_schema_tool.schema import SchemaValidator, SchemaValidator, Validation
 from json_schema_tool.types import JsonType
 from json_schema_tool.exception import PreprocessorException
 import zipfile
+from functools import lru_cache
 
-from ._util import un_group
+from ._util import un_group, json_loads, yaml_load, VersionedData
 
 JSON = Union[str, int, float, bool, None, Dict[str, Any], List[Any]]
 
@@ -28,41 +28,35 @@ class AasSchema:
         self.submodel_schemas = submodel_schemas
 
 
-def _find_schemas() -> Dict[str, AasSchema]:
-    result = {}
-    script_dir = os.path.dirname(os.path.realpath(__file__))
-    data_dir = os.path.join(script_dir, 'data', 'file')
-    for i in os.listdir(data_dir):
-        path = os.path.join(data_dir, i)
-        if not i.endswith('.yml'):
-            continue
-        schema = safe_load(open(path, "rb"))
-        # TODO: remove these after fixing fences.core.exception.InternalException: Decision without valid leaf detected
-        del schema['$defs']['AssetInformation']['allOf'][1]['properties']['specificAssetIds']['items']['allOf'][0]
-        del schema['$defs']['Entity']['allOf'][1]
-        config = ParseConfig(
-            format_validators=validators
-        )
-        validator = parse_schema(schema, config)
-        submodel_templates = {}
-        submodel_schemas = {}
-        for key, submodel_schema in schema['$defs']['SubmodelTemplates'].items():
-            submodel_schema['$defs'] = schema['$defs']
-            submodel_schema['$schema'] = 'https://json-schema.org/draft/2020-12/schema'
-            submodel_templates[key] = parse_schema(submodel_schema, config)
-            submodel_schemas[key] = submodel_schema
-        result[i[:-4]] = AasSchema(validator, schema, submodel_templates, submodel_schemas)
-    return result
-
-
-_schemas = _find_schemas()
+def _load_schema(path: str) -> AasSchema:
+    with open(path, "rb") as f:
+        schema = yaml_load(f.read())
+    # TODO: remove these after fixing fences.core.exception.InternalException: Decision without valid leaf detected
+    del schema['$defs']['AssetInformation']['allOf'][1]['properties']['specificAssetIds']['items']['allOf'][0]
+    del schema['$defs']['Entity']['allOf'][1]
+    config = ParseConfig(
+        format_validators=validators
+    )
+    validator = parse_schema(schema, config)
+    submodel_templates = {}
+    submodel_schemas = {}
+    for key, submodel_schema in schema['$defs']['SubmodelTemplates'].items():
+        submodel_schema['$defs'] = schema['$defs']
+        submodel_schema['$schema'] = 'https://json-schema.org/draft/2020-12/schema'
+        submodel_templates[key] = parse_schema(submodel_schema, config)
+        submodel_schemas[key] = submodel_schema
+    return AasSchema(validator, schema, submodel_templates, submodel_schemas)
+
+
+# Schemas are parsed on first use only
+_schemas = VersionedData(os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data', 'file'), _load_schema)
 _DEFAULT_VERSION = '3.0'
 
 
 def supported_versions() -> Dict[str, List[str]]:
     return {
-        i: list(aas.submodel_templates.keys())
-        for i, aas in _schemas.items()
+        i: list(_schemas.get(i).submodel_templates.keys())
+        for i in _schemas.versions()
     }
 
 
@@ -70,11 +64,9 @@ def latest_version():
     return _DEFAULT_VERSION
 
 
-def _get_schema(version: str, submodel_templates: Set[str]) -> AasSchema:
-    try:
-        schema = _schemas[version]
-    except KeyError:
-        raise AasTestToolsException(f"Unknown version {version}, must be one of {supported_versions()}")
+@lru_cache(maxsize=None)
+def _get_checked_schema(version: str, submodel_templates: FrozenSet[str]) -> AasSchema:
+    schema = _schemas.get(version)
     all_templates = schema.submodel_templates.keys()
     unknown = submodel_templates - all_templates
     if unknown:
@@ -82,14 +74,45 @@ def _get_schema(version: str, submodel_templates: Set[str]) -> AasSchema:
     return schema
 
 
+def _get_schema(version: str, submodel_templates: Set[str]) -> AasSchema:
+    return _get_checked_schema(version, frozenset(submodel_templates))
+
+
 def _map_error(parent: AasTestResult, error: SchemaValidationResult):
-    for i in error.keyword_results:
-        if i.ok():
-            continue
-        kw_result = AasTestResult(i.error_message, '', Level.ERROR)
-        for j in i.sub_schema_results:
-            _map_error(kw_result, j)
-        parent.append(kw_result)
+    stack = [(parent, error)]
+    while stack:
+        parent, error = stack.pop()
+        for i in error.keyword_results:
+            if i.ok():
+                continue
+            kw_result = AasTestResult(i.error_message, '', Level.ERROR)
+            parent.append(kw_result)
+            # reversed, so sub results are popped (and appended) in their original order
+            stack.extend((kw_result, j) for j in reversed(i.sub_schema_results))
+
+
+def _group_by_preprocessor(data: JSON, validator: SchemaValidator) -> JSON:
+    try:
+        group_by = validator.schema['groupBy']
+    except KeyError:
+        return data
+    result: Dict[str, List[any]] = {}
+    if not isinstance(data, list):
+        raise PreprocessorException("Expected an array")
+    for idx, value in enumerate(data):
+        try:
+            key = value[group_by]
+        except KeyError:
+            raise PreprocessorException(f"Property {group_by} is missing at idx {idx}")
+        if not isinstance(key, str):
+            raise PreprocessorException(f"{key} must be a string at idx {idx}")
+        result.setdefault(key, []).append(value)
+    return result
+
+
+_TEMPLATE_VALIDATION_CONFIG = ValidationConfig(
+    preprocessor=_group_by_preprocessor
+)
 
 
 def check_json_data(data: any, version: str = _DEFAULT_VERSION, submodel_templates: Set = set()) -> AasTestResult:
@@ -98,36 +121,11 @@ def check_json_data(data: any, version: str = _DEFAULT_VERSION, submodel_templat
     error = schema.validator.validate(data)
     _map_error(result, error)
     if submodel_templates and result.ok():
-
-        def preprocess(data: ElementTree.Element, validator: SchemaValidator) -> JSON:
-            try:
-                group_by = validator.schema['groupBy']
-            except KeyError:
-                return data
-            result: Dict[str, List[any]] = {}
-            if not isinstance(data, list):
-                raise PreprocessorException("Expected an array")
-            for idx, value in enumerate(data):
-                try:
-                    key = value[group_by]
-                except KeyError:
-                    raise PreprocessorException(f"Property {group_by} is missing at idx {idx}")
-                if not isinstance(key, str):
-                    raise PreprocessorException(f"{key} must be a string at idx {idx}")
-                try:
-                    result[key].append(value)
-                except KeyError:
-                    result[key] = [value]
-            return result
-
         submodels_result = AasTestResult('Checking submodel templates')
         for name in submodel_templates:
             submodel_result = AasTestResult(f"Checking for {name}")
             validator = schema.submodel_templates[name]
-            config = ValidationConfig(
-                preprocessor=preprocess
-            )
-            error = validator.validate(data, config)
+            error = validator.validate(data, _TEMPLATE_VALIDATION_CONFIG)
             _map_error(submodel_result, error)
             submodels_result.append(submodel_result)
         result.append(submodels_result)
@@ -136,7 +134,7 @@ def check_json_data(data: any, version: str = _DEFAULT_VERSION, submodel_templat
 
 def check_json_file(file: TextIO, version: str = _DEFAULT_VERSION, submodel_templates: Set = set()) -> AasTestResult:
     try:
-        data = json.load(file)
+        data = json_loads(file.read())
     except json.decoder.JSONDecodeError as e:
         return AasTestResult(f"Invalid JSON: {e}", '', Level.ERROR)
     return check_json_data(data, version, submodel_templates)
@@ -364,6 +362,37 @@ def check_aasx_data(zipfile: zipfile.ZipFile, version: str = _DEFAULT_VERSION) -
     return result
 
 
+class _Directory:
+    """Exposes an unpacked package with the part of the zipfile.ZipFile interface used by check_aasx_data"""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.names: List[str] = []
+        for root, subdirs, files in os.walk(path):
+            for file in files:
+                real_path = os.path.join(root, file)
+                self.names.append(os.path.relpath(real_path, path).replace(os.sep, '/'))
+        self._names = set(self.names)
+
+    def namelist(self) -> List[str]:
+        return self.names
+
+    def open(self, name: str, mode: str = 'r'):
+        if mode != 'r':
+            raise ValueError('The package can only be opened for reading, mode must be "r"')
+        # like ZipFile, only allow members of the package
+        if name not in self._names:
+            raise KeyError(f"There is no item named '{name}' in the package")
+        return open(os.path.join(self.path, name), 'rb')
+
+
+def check_aasx_dir(path: str, version: str = _DEFAULT_VERSION) -> AasTestResult:
+    """Checks an already unpacked AASX package"""
+    if not os.path.isdir(path):
+        return AasTestResult(f"Cannot read: {path} is not a directory", level=Level.ERROR)
+    return check_aasx_data(_Directory(path), version)
+
+
 def check_aasx_file(file: TextIO, version: str = _DEFAULT_VERSION) -> AasTestResult:
     try:
         zip = zipfile.ZipFile(file)
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Generator
 from enum import Enum
 import os
 
@@ -11,16 +11,23 @@ class Level(Enum):
     ERROR = 2
 
     def __or__(self, other: "Level") -> "Level":
-        return Level(max(self.value, other.value))
+        return self if self.value >= other.value else other
 
     def color(self) -> str:
-        if self.value == 0:
-            return '\033[92m'
-        if self.value == 1:
-            return '\033[93m'
-        if self.value == 2:
-            return '\033[91m'
-        return '\033[94m'
+        return _COLORS[self]
+
+
+_COLORS = {
+    Level.INFO: '\033[92m',
+    Level.WARNING: '\033[93m',
+    Level.ERROR: '\033[91m',
+}
+
+_HTML_CLASSES = {
+    Level.INFO: 'info',
+    Level.WARNING: 'warning',
+    Level.ERROR: 'error',
+}
 
 
 class AasTestResult:
@@ -38,19 +45,19 @@ class AasTestResult:
     def ok(self) -> bool:
         return self.level != Level.ERROR
 
-    def dump(self, indent=0, path=''):
-        """Outputs the result to console"""
+    def _dump_lines(self, indent: int) -> Generator[str, None, None]:
         ENDC = '\033[0m'
-        print("   " * indent + self.level.color() + self.message + ENDC)
+        yield "   " * indent + self.level.color() + self.message + ENDC
         for sub_result in self.sub_results:
-            sub_result.dump(indent + 1, path + "/" + self.path_fragment)
+            yield from sub_result._dump_lines(indent + 1)
+
+    def dump(self, indent=0, path=''):
+        """Outputs the result to console"""
+        # A single write instead of one per line
+        print("\n".join(self._dump_lines(indent)))
 
     def _to_html(self) -> str:
-        cls = {
-            Level.INFO: 'info',
-            Level.WARNING: 'warning',
-            Level.ERROR: 'error'
-        }[self.level]
+        cls = _HTML_CLASSES[self.level]
         s = "<div>\n"
         if self.sub_results:
             s += f'<div class="{cls}">{self.message}<span class="caret"/></div>\n'
@@ -1,55 +1,66 @@
 #! /usr/bin/env python3
 
 import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from timeit import default_timer
 from aas_test_engines import file
 
 script_dir = os.path.dirname(os.path.realpath(__file__))
 
+BLACKLIST = [
+    'UnexpectedAdditionalProperty',
+    'Double/lowest.',
+    'Double/max.',
+    'Float/largest_normal.',
+    'ConstraintViolation/Reference/',
+    'ConstraintViolation/reference',
+    'ConstraintViolation/SubmodelElementList',
+    'ConstraintViolation/submodelElementList',
+    'basicEventElement/messageTopic.xml',
+    'TypeViolation/langStringNameType/text.xml',
+    'TypeViolation/blob/value.xml',
+    'TypeViolation/langStringShortNameTypeIec61360/text.xml',
+    'TypeViolation/assetInformation/assetType.xml',
+    'TypeViolation/assetInformation/globalAssetId.xml',
+    'TypeViolation/submodelElementList/orderRelevant.xml',
+    'TypeViolation/conceptDescription/administration.xml',
+    'TypeViolation/conceptDescription/id.xml',
+    'TypeViolation/administrativeInformation/templateId.xml',
+    'TypeViolation/specificAssetId/value.xml',
+    'TypeViolation/specificAssetId/name.xml',
+    'TypeViolation/langStringPreferredNameTypeIec61360/text.xml',
+    'TypeViolation/langStringTextType/text.xml',
+    'TypeViolation/submodel/administration.xml',
+    'TypeViolation/submodel/id.xml',
+    'TypeViolation/dataSpecificationIec61360/symbol.xml',
+    'TypeViolation/dataSpecificationIec61360/value.xml',
+    'TypeViolation/dataSpecificationIec61360/sourceOfDefinition.xml',
+    'TypeViolation/dataSpecificationIec61360/valueFormat.xml',
+    'TypeViolation/dataSpecificationIec61360/unit.xml',
+    'TypeViolation/langStringDefinitionTypeIec61360/text.xml',
+    'TypeViolation/assetAdministrationShell/administration.xml',
+    'TypeViolation/assetAdministrationShell/id.xml',
+    'TypeViolation/key/value.xml',
+    'TypeViolation/valueReferencePair/value.xml',
+    'TypeViolation/levelType/min.xml',
+    'TypeViolation/levelType/max.xml',
+    'TypeViolation/levelType/typ.xml',
+    'TypeViolation/levelType/nom.xml',
+]
+# Entries are matched as substrings of the path, a single regex checks all of them at once
+_BLACKLIST_PATTERN = re.compile('|'.join(re.escape(i) for i in BLACKLIST))
+
+
 def is_blacklisted(path):
-    blacklist = [
-        'UnexpectedAdditionalProperty',
-        'Double/lowest.',
-        'Double/max.',
-        'Float/largest_normal.',
-        'ConstraintViolation/Reference/',
-        'ConstraintViolation/reference',
-        'ConstraintViolation/SubmodelElementList',
-        'ConstraintViolation/submodelElementList',
-        'basicEventElement/messageTopic.xml',
-        'TypeViolation/langStringNameType/text.xml',
-        'TypeViolation/blob/value.xml',
-        'TypeViolation/langStringShortNameTypeIec61360/text.xml',
-        'TypeViolation/assetInformation/assetType.xml',
-        'TypeViolation/assetInformation/globalAssetId.xml',
-        'TypeViolation/submodelElementList/orderRelevant.xml',
-        'TypeViolation/conceptDescription/administration.xml',
-        'TypeViolation/conceptDescription/id.xml',
-        'TypeViolation/administrativeInformation/templateId.xml',
-        'TypeViolation/specificAssetId/value.xml',
-        'TypeViolation/specificAssetId/name.xml',
-        'TypeViolation/langStringPreferredNameTypeIec61360/text.xml',
-        'TypeViolation/langStringTextType/text.xml',
-        'TypeViolation/submodel/administration.xml',
-        'TypeViolation/submodel/id.xml',
-        'TypeViolation/dataSpecificationIec61360/symbol.xml',
-        'TypeViolation/dataSpecificationIec61360/value.xml',
-        'TypeViolation/dataSpecificationIec61360/sourceOfDefinition.xml',
-        'TypeViolation/dataSpecificationIec61360/valueFormat.xml',
-        'TypeViolation/dataSpecificationIec61360/unit.xml',
-        'TypeViolation/langStringDefinitionTypeIec61360/text.xml',
-        'TypeViolation/assetAdministrationShell/administration.xml',
-        'TypeViolation/assetAdministrationShell/id.xml',
-        'TypeViolation/key/value.xml',
-        'TypeViolation/valueReferencePair/value.xml',
-        'TypeViolation/levelType/min.xml',
-        'TypeViolation/levelType/max.xml',
-        'TypeViolation/levelType/typ.xml',
-        'TypeViolation/levelType/nom.xml',
-    ]
-    for i in blacklist:
-        if i in path:
-            return True
-    return False
+    return _BLACKLIST_PATTERN.search(path) is not None
+
+
+def check_file(check, path: str) -> bool:
+    with open(path) as f:
+        return check(f).ok()
+
 
 def run(dirname: str, check):
     print(f"Testing {dirname}, this might take a few minutes...")
@@ -58,15 +69,24 @@ def run(dirname: str, check):
     invalid_accepted = 0
     invalid_rejected = 0
     skipped = 0
+    paths = []
     for root, dirs, files in os.walk(os.path.join(script_dir, f'../fixtures/aas-core3.0-testgen/test_data/{dirname}/ContainedInEnvironment'), topdown=False):
         for name in files:
             path_in = os.path.join(root, name)
             if is_blacklisted(path_in):
                 skipped += 1
                 continue
-            with open(path_in) as f:
-                errors = check(f)
-            if errors.ok():
+            paths.append(path_in)
+    # The files are independent, leave two cores for the rest of the system
+    max_workers = max(1, (os.cpu_count() or 1) - 2)
+    # Report progress at most once per second, so printing does not slow down the workers
+    next_report = default_timer() + 1.0
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for idx, (path_in, ok) in enumerate(zip(paths, executor.map(check_file, repeat(check), paths, chunksize=16))):
+            if default_timer() >= next_report:
+                print(f"{idx}/{len(paths)}")
+                next_report = default_timer() + 1.0
+            if ok:
                 if 'Expected' in path_in:
                     valid_accepted += 1
                 else:
@@ -1,6 +1,34 @@
 from unittest import TestCase
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import os
+import shutil
+import tempfile
+import warnings
+from unittest import mock
+import requests
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
 
 from aas_test_engines import api
+from aas_test_engines.result import Level
+from aas_test_engines._api import run, runconf
+from aas_test_engines._api.runtime_expression import RuntimeExpression
+
+
+def make_test_case(method: str, path: str, variables: Optional[Dict[str, str]] = None, schema: Optional[dict] = None) -> runconf.TestCase:
+    if variables is None:
+        variables = {}
+    return runconf.TestCase(
+        request=runconf.Request(path=path, method=method, headers={}, body=''),
+        response=runconf.Response(
+            code=200,
+            content=json.dumps(schema),
+            match=runconf.MatchType.STATUS_CODE_ONLY if schema is None else runconf.MatchType.JSON_SCHEMA,
+            variables={k: RuntimeExpression.from_string(v) for k, v in variables.items()},
+        ),
+    )
 
 
 class ApiTestCase(TestCase):
@@ -16,3 +44,215 @@ class SupportedVersionsTest(TestCase):
         for i in s:
             print(i)
         self.assertIn(api.latest_version(), s)
+
+
+class SpecCacheTest(TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, '3.0.yml')
+        self.cache_path = self.path + '.cache.pkl'
+        shutil.copy(os.path.join(api._specs.data_dir, '3.0.yml'), self.path)
+
+    def tearDown(self):
+        os.chmod(self.dir, 0o755)
+        shutil.rmtree(self.dir)
+
+    def load(self):
+        with mock.patch.object(api, '_parse_spec', wraps=api._parse_spec) as parse:
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter('always')
+                spec = api._load_spec(self.path)
+        return spec, parse.call_count, [(i.category, str(i.message)) for i in caught]
+
+    def test_cold_load(self):
+        spec, num_parsed, _ = self.load()
+        self.assertEqual(num_parsed, 1)
+        self.assertTrue(spec.tags)
+        self.assertEqual(sorted(os.listdir(self.dir)), ['3.0.yml', '3.0.yml.cache.pkl'])
+
+    def test_warm_load(self):
+        spec, _, cold_warnings = self.load()
+        cached_spec, num_parsed, warm_warnings = self.load()
+        self.assertEqual(num_parsed, 0)
+        self.assertEqual(cached_spec.tags, spec.tags)
+        self.assertEqual([i.path for i in cached_spec.api.paths], [i.path for i in spec.api.paths])
+        self.assertTrue(cold_warnings)
+        self.assertEqual(warm_warnings, cold_warnings)
+
+    def test_spec_changed(self):
+        self.load()
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        _, num_parsed, _ = self.load()
+        self.assertEqual(num_parsed, 1)
+
+    def test_broken_cache(self):
+        self.load()
+        with open(self.cache_path, 'rb') as f:
+            content = f.read()
+        for broken in [content[:len(content) // 2], b'garbage']:
+            with open(self.cache_path, 'wb') as f:
+                f.write(broken)
+            spec, num_parsed, _ = self.load()
+            self.assertEqual(num_parsed, 1)
+            self.assertTrue(spec.tags)
+
+    def test_read_only_dir(self):
+        os.chmod(self.dir, 0o555)
+        real_open = open
+
+        def read_only_open(file, mode='r', *args, **kwargs):
+            # root ignores the permissions, so deny writing explicitly
+            if 'w' in mode and os.path.dirname(file) == self.dir:
+                raise PermissionError(13, 'Permission denied', file)
+            return real_open(file, mode, *args, **kwargs)
+
+        with mock.patch('builtins.open', read_only_open):
+            spec, num_parsed, _ = self.load()
+        self.assertEqual(num_parsed, 1)
+        self.assertTrue(spec.tags)
+        self.assertEqual(os.listdir(self.dir), ['3.0.yml'])
+
+
+class IndependentBatchesTest(TestCase):
+
+    def test_batches(self):
+        test_cases = [
+            make_test_case('get', '/a', {'x': '$response.body#$.id'}),
+            make_test_case('get', '/b'),
+            make_test_case('get', '/c/!{x_base64}'),
+            make_test_case('post', '/d'),
+            make_test_case('get', '/e/!{x_base64}'),
+        ]
+        batches = list(run._independent_batches(test_cases))
+        self.assertEqual([len(i) for i in batches], [2, 1, 1, 1])
+        self.assertEqual([i.request.path for i in batches[1]], ['/c/!{x_base64}'])
+        self.assertEqual([i.request.method for i in batches[2]], ['post'])
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # (method, path, cookie header) of all requests received
+    received: List[Tuple[str, str, Optional[str]]] = []
+
+    def record(self):
+        self.received.append((self.command, self.path, self.headers.get('cookie')))
+
+    def do_HEAD(self):
+        self.record()
+        self.send_response(200)
+        self.send_header('content-length', '0')
+        self.end_headers()
+
+    def do_GET(self):
+        self.record()
+        if self.path.startswith('/slow/'):
+            # lets responses within a batch arrive out of order
+            time.sleep(float(self.path[len('/slow/'):]))
+        code = 404 if self.path.startswith('/missing') else 200
+        data = json.dumps({'path': self.path, 'id': 'id' + str(len(self.path))}).encode()
+        self.send_response(code)
+        self.send_header('content-type', 'application/json')
+        self.send_header('content-length', str(len(data)))
+        self.send_header('set-cookie', 'sid=abc')
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_POST = do_GET
+
+    def log_message(self, *args):
+        pass
+
+
+class LocalServerTestCase(TestCase):
+    handler = EchoHandler
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), cls.handler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.handler.received.clear()
+
+    def exec_conf(self, **kwargs) -> run.ExecConf:
+        return run.ExecConf(server=f'http://127.0.0.1:{self.server.server_port}', **kwargs)
+
+
+class CookieTest(LocalServerTestCase):
+
+    def test_no_cookies_sent(self):
+        config = runconf.RunConfig(
+            test_cases=[make_test_case('get', '/a'), make_test_case('get', '/b')],
+            components={},
+        )
+        results = list(run.run(config, self.exec_conf()))
+        self.assertTrue(all(i.ok() for i in results))
+        self.assertEqual(self.handler.received, [
+            ('HEAD', '/', None),
+            ('GET', '/a', None),
+            ('GET', '/b', None),
+        ])
+
+
+class NoHeadHandler(EchoHandler):
+    received: List[Tuple[str, str, Optional[str]]] = []
+
+    def do_HEAD(self):
+        self.record()
+        self.send_response(405)
+        self.send_header('content-length', '0')
+        self.end_headers()
+
+
+class CheckServerTest(LocalServerTestCase):
+    handler = NoHeadHandler
+
+    def test_head_not_allowed(self):
+        with requests.Session() as session:
+            result = run._check_server(self.exec_conf(), session)
+        self.assertTrue(result.ok())
+        self.assertEqual([i.message for i in result.sub_results], ['OK'])
+        self.assertEqual(self.handler.received, [('HEAD', '/', None), ('GET', '/', None)])
+
+
+class RunConcurrentlyTest(LocalServerTestCase):
+
+    def execute(self, config: runconf.RunConfig, max_concurrency: int):
+        exec_conf = self.exec_conf(max_concurrency=max_concurrency)
+        results = []
+        for result in run.run(config, exec_conf):
+            results.append((result.message, result.level, [(i.message, i.level) for i in result.sub_results]))
+        return results
+
+    def test_same_as_sequential(self):
+        config = runconf.RunConfig(
+            test_cases=[
+                make_test_case('get', '/slow/0.2', {'x': '$response.body#$.id'}),
+                make_test_case('get', '/slow/0.1', {'y': '$response.body#$.path'}),
+                make_test_case('get', '/missing'),
+                make_test_case('get', '/a', schema={'type': 'object', 'required': ['path']}),
+                make_test_case('get', '/b', schema={'type': 'object', 'required': ['missing']}),
+                make_test_case('get', '/shells/!{x_base64}/!{y_base64}'),
+                make_test_case('get', '/!{unknown_base64}'),
+                make_test_case('post', '/c/!{x_base64}'),
+                make_test_case('get', '/slow/0.1'),
+                make_test_case('get', '/d'),
+            ],
+            components={},
+        )
+        sequential = self.execute(config, 1)
+        concurrent = self.execute(config, 4)
+        self.assertEqual(sequential, concurrent)
+        messages = [i[0] for i in sequential]
+        self.assertTrue(messages[6].endswith('/shells/aWQ5/L3Nsb3cvMC4x'))
+        self.assertEqual([i[1] for i in sequential], [
+            Level.INFO, Level.INFO, Level.INFO, Level.ERROR, Level.INFO, Level.ERROR,
+            Level.INFO, Level.ERROR, Level.INFO, Level.INFO, Level.INFO,
+        ])
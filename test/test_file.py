@@ -3,6 +3,7 @@ import os
 import zipfile
 import io
 import json
+from functools import lru_cache
 from xml.etree import ElementTree
 
 from aas_test_engines import file, exception
@@ -11,15 +12,21 @@ from aas_test_engines.result import Level
 script_dir = os.path.dirname(os.path.realpath(__file__))
 
 
-def in_memory_zipfile(path: str):
+@lru_cache(maxsize=None)
+def _build_fixture_zip_bytes(path: str) -> bytes:
     buffer = io.BytesIO()
-    zip = zipfile.ZipFile(buffer, "a", zipfile.ZIP_DEFLATED, False)
-    for root, subdirs, files in os.walk(path):
-        for file in files:
-            real_path = os.path.join(root, file)
-            archive_path = real_path[len(path)+1:]
-            zip.write(real_path, archive_path)
-    return zip
+    # compression is irrelevant for the tests, so skip it
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_STORED, False) as zip:
+        for root, subdirs, files in os.walk(path):
+            for file in files:
+                real_path = os.path.join(root, file)
+                archive_path = real_path[len(path)+1:]
+                zip.write(real_path, archive_path)
+    return buffer.getvalue()
+
+
+def in_memory_zipfile(path: str):
+    return zipfile.ZipFile(io.BytesIO(_build_fixture_zip_bytes(path)))
 
 
 class CheckJsonTest(TestCase):
@@ -138,6 +145,33 @@ class CheckAasxTest(TestCase):
         self.assertEqual(result.level, Level.WARNING)
 
 
+class CheckAasxDirTest(TestCase):
+
+    def test_not_a_dir(self):
+        result = file.check_aasx_dir(os.path.join(script_dir, 'fixtures/aasx/does_not_exist'))
+        result.dump()
+        self.assertEqual(result.level, Level.ERROR)
+
+    def test_valid_json(self):
+        result = file.check_aasx_dir(os.path.join(script_dir, 'fixtures/aasx/valid/json'))
+        result.dump()
+        self.assertEqual(result.level, Level.INFO)
+
+    def test_invalid_rels(self):
+        result = file.check_aasx_dir(os.path.join(script_dir, 'fixtures/aasx/invalid/invalid_rels'))
+        result.dump()
+        self.assertEqual(result.level, Level.ERROR)
+
+    def test_same_as_zip(self):
+        for kind in ['valid', 'invalid']:
+            fixtures_dir = os.path.join(script_dir, 'fixtures', 'aasx', kind)
+            for name in sorted(os.listdir(fixtures_dir)):
+                path = os.path.join(fixtures_dir, name)
+                zip_result = file.check_aasx_data(in_memory_zipfile(path))
+                dir_result = file.check_aasx_dir(path)
+                self.assertEqual(zip_result.to_dict(), dir_result.to_dict(), path)
+
+
 class SupportedVersionTest(TestCase):
 
     def test_invoke(self):
@@ -1,5 +1,8 @@
 from unittest import TestCase
-from aas_test_engines._util import group, un_group
+import os
+import tempfile
+from aas_test_engines._util import group, un_group, VersionedData
+from aas_test_engines.exception import AasTestToolsException
 
 
 class GroupSmcTest(TestCase):
@@ -75,3 +78,19 @@ class GroupSmcTest(TestCase):
             ]
         }
         result = group(input)
+
+
+class VersionedDataTest(TestCase):
+
+    def test_load_once(self):
+        with tempfile.TemporaryDirectory() as data_dir:
+            for name in ['2.0.yml', '1.0.yml', 'README.md']:
+                open(os.path.join(data_dir, name), 'w').close()
+            loaded = []
+            data = VersionedData(data_dir, lambda path: loaded.append(path) or len(loaded))
+            self.assertEqual(data.versions(), ('1.0', '2.0'))
+            self.assertEqual(data.get('2.0'), 1)
+            self.assertEqual(data.get('2.0'), 1)
+            self.assertEqual(loaded, [os.path.join(data_dir, '2.0.yml')])
+            with self.assertRaises(AasTestToolsException):
+                data.get('3.0')